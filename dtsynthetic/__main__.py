@@ -0,0 +1,5 @@
+import sys
+
+from dtsynthetic.cli import main
+
+sys.exit(main())
@@ -1,9 +1,13 @@
-import requests
 import json
 import re
 import pandas as pd
 
 from dtsynthetic.monitors import HTTPMonitor, BrowserMonitor, DraftHTTPMonitor, DraftBrowserMonitor
+from dtsynthetic.flight import SingleFlight, get_json
+from dtsynthetic.parallel import bounded_map, RateLimiter
+from dtsynthetic.templates import MonitorTemplate
+from dtsynthetic.validation import DraftValidator
+from dtsynthetic.snapshot import open_snapshot, read_snapshot
 
 class SyntheticAPI:
 
@@ -18,13 +22,25 @@ class SyntheticAPI:
         self.tenant = self.__validate_url(tenant)
         self.api_key = api_key
         self.__headers = {'Authorization' : f'Api-Token {self.api_key}', 'Content-Type' : 'application/json'}
+        self.__flight = SingleFlight()
+        self.validator = DraftValidator({'tenant' : self.tenant, 'headers' : self.__headers, 'flight' : self.__flight})
 
     def new_monitor(self, data:dict):
         if data['type'] == 'HTTP':
-            return DraftHTTPMonitor(data=data, request_data={'tenant' : self.tenant, 'headers' : self.__headers})
+            return DraftHTTPMonitor(data=data, request_data={'tenant' : self.tenant, 'headers' : self.__headers, 'flight' : self.__flight})
         elif data['type'] == 'BROWSER':
-            return DraftBrowserMonitor(data=data, request_data={'tenant' : self.tenant, 'headers' : self.__headers})
+            return DraftBrowserMonitor(data=data, request_data={'tenant' : self.tenant, 'headers' : self.__headers, 'flight' : self.__flight})
         
+    def new_monitors_from_template(self, template, rows, processes:int=None, types:dict=None):
+        """Stamps out one draft monitor per parameter row
+        :param template: A MonitorTemplate, or a monitor dict containing {{placeholder}} markers
+        :param rows: A path to a csv file, a DataFrame, or any iterable of dicts
+        :param processes: When set, rows are rendered in a pool of this many processes
+        :param types: Parameter types used when template is a dict, see MonitorTemplate
+        """
+        if not isinstance(template, MonitorTemplate): template = MonitorTemplate(template, types)
+        return [self.new_monitor(x) for x in template.render_all(rows, processes)]
+
     def load_simple_http_csv(self, path:str):
         df = pd.read_csv(path, low_memory=False)
         monitors = []
@@ -72,26 +88,24 @@ class SyntheticAPI:
                 if body['script']['requests'][0]['requestBody'] is None:
                     del body['script']['requests'][0]['requestBody']
 
-                monitors.append(DraftHTTPMonitor(data=body, request_data={'tenant' : self.tenant, 'api_key':self.api_key, 'headers' : self.__headers}))
+                monitors.append(DraftHTTPMonitor(data=body, request_data={'tenant' : self.tenant, 'api_key':self.api_key, 'headers' : self.__headers, 'flight' : self.__flight}))
         
         return monitors
 
     def get_monitor(self, entityId:str, detailed:bool=False):
         url = self.tenant + f'/api/v1/synthetic/monitors/{entityId}'
-        result = requests.get(url, headers = self.__headers)
-        if result.ok:
-            data = json.loads(result.content)
+        ok, data = get_json({'headers' : self.__headers, 'flight' : self.__flight}, url)
+        if ok:
+            # The monitor endpoint already returns full details, so a detailed monitor needs no second request
             if data['type'] == 'HTTP':
-                new_monitor = HTTPMonitor(data, {'tenant' : self.tenant,'headers' : self.__headers}, False)
+                new_monitor = HTTPMonitor(data, {'tenant' : self.tenant,'headers' : self.__headers, 'flight' : self.__flight}, detailed)
             else:
-                new_monitor = BrowserMonitor(data, {'tenant' : self.tenant,'headers' : self.__headers}, False)
-
-            if detailed: new_monitor.get_details()
+                new_monitor = BrowserMonitor(data, {'tenant' : self.tenant,'headers' : self.__headers, 'flight' : self.__flight}, detailed)
             
             return new_monitor
         
         else:
-            raise Exception(result.content)
+            raise Exception(data)
         
     def update(self, monitors:list):
         success = []
@@ -110,6 +124,118 @@ class SyntheticAPI:
             'failure' : failure
         }
 
+    def create(self, monitors:list, validate:bool=True, workers:int=8):
+        """Creates draft monitors concurrently
+        When validate is set every draft is checked locally first, drafts that fail are reported without being sent.
+        """
+        success = []
+        failure = []
+        if not monitors: return
+        if validate:
+            checked = self.validator.validate_all(monitors)
+            monitors = checked['valid']
+            failure += [{'status' : None, 'entityId' : None, 'name' : x.name, 'message' : errors} for x, errors in checked['invalid']]
+
+        def create(monitor):
+            created = monitor.create()
+            if isinstance(created, dict):
+                return {'status' : created['status_code'], 'entityId' : None, 'name' : monitor.name, 'message' : created['_content']}
+            return {'status' : 201, 'entityId' : created.entityId, 'name' : monitor.name, 'message' : None}
+
+        for x in bounded_map(create, monitors, workers):
+            if x['status'] == 201:
+                success.append(x)
+            else:
+                failure.append(x)
+        return {
+            'success_count' : len(success),
+            'failure_count' : len(failure),
+            'success' : success,
+            'failure' : failure
+        }
+
+    def export_jsonl(self, path:str, params:dict={}, workers:int=8, compress:bool=None):
+        """Streams every monitor matching params to a JSON lines file, one fully detailed monitor per line
+        Monitors whose details cannot be fetched are left out of the file and reported as failures.
+        :param path: File to write, gzip compressed when compress is set or the path ends in ".gz"
+        :param params: Same filters accepted by get_monitors
+        :param workers: Number of monitors hydrated concurrently
+        """
+
+        success = []
+        failure = []
+        with open_snapshot(path, 'w', compress) as f:
+            for x in bounded_map(self.hydrate, self.get_monitors(params), workers):
+                if x['status'] == 200:
+                    f.write(json.dumps(x.pop('data')) + '\n')
+                    success.append(x)
+                else:
+                    failure.append(x)
+        return {
+            'success_count' : len(success),
+            'failure_count' : len(failure),
+            'success' : success,
+            'failure' : failure
+        }
+
+    def hydrate(self, monitor):
+        """Fetches the details of a monitor listed by get_monitors, never raises
+        On success the result carries the monitor's full data under "data", ready to be written to a snapshot.
+        """
+        try:
+            monitor.get_details()
+            if not monitor.is_detailed: raise Exception(f'Could not fetch details for {monitor.entityId}')
+            return {'status' : 200, 'entityId' : monitor.entityId, 'message' : None, 'data' : monitor.data()}
+        except Exception as e:
+            return {'status' : None, 'entityId' : monitor.entityId, 'message' : str(e)}
+
+    def import_jsonl(self, path, predicate=None, workers:int=8, compress:bool=None, limiter:RateLimiter=None):
+        """Restores monitors from a file written by export_jsonl
+        Monitors whose entityId already exists on the tenant are updated, all others are created as new monitors.
+        A record that cannot be restored is reported as a failure without stopping the rest.
+        :param path: File to read, gzip compressed when compress is set or the path ends in ".gz". Any iterable of monitor dicts is accepted too
+        :param predicate: Optional callable taking the monitor dict, only monitors it returns True for are restored
+        :param workers: Number of monitors written concurrently
+        :param limiter: Optional RateLimiter every write waits for
+        """
+        existing = {x.entityId for x in self.get_monitors()}
+
+        success = []
+        failure = []
+        source = read_snapshot(path, compress) if isinstance(path, str) else path
+        monitors = (x for x in source if predicate is None or predicate(x))
+        for x in bounded_map(lambda data: self.restore(data, existing), monitors, workers, limiter=limiter):
+            if x['status'] in (201, 204):
+                success.append(x)
+            else:
+                failure.append(x)
+        return {
+            'success_count' : len(success),
+            'failure_count' : len(failure),
+            'success' : success,
+            'failure' : failure
+        }
+
+    def restore(self, data:dict, existing:set):
+        """Updates the monitor if its entityId is in existing, otherwise creates it as a new monitor
+        Never raises, problems are returned with status None and the error as message, the same shape update() reports.
+        """
+        try:
+            if not isinstance(data, dict): raise Exception(f'Expected a monitor JSON object, got {data!r}.')
+            if data.get('type') not in ('HTTP', 'BROWSER'): raise Exception(f'Invalid monitor type {data.get("type")}. Only HTTP and BROWSER monitors can be restored.')
+            if data.get('entityId') in existing:
+                if data['type'] == 'HTTP':
+                    monitor = HTTPMonitor(data, {'tenant' : self.tenant,'headers' : self.__headers, 'flight' : self.__flight}, True)
+                else:
+                    monitor = BrowserMonitor(data, {'tenant' : self.tenant,'headers' : self.__headers, 'flight' : self.__flight}, True)
+                return monitor.update()
+            created = self.new_monitor(data).create()
+            if isinstance(created, dict):
+                return {'status' : created['status_code'], 'entityId' : data.get('entityId'), 'message' : created['_content']}
+            return {'status' : 201, 'entityId' : created.entityId, 'message' : None}
+        except Exception as e:
+            return {'status' : None, 'entityId' : data.get('entityId') if isinstance(data, dict) else None, 'message' : str(e)}
+
     def get_monitors(self, params:dict={}, detailed:bool=False):
         url = self.tenant + '/api/v1/synthetic/monitors'
 
@@ -134,14 +260,27 @@ class SyntheticAPI:
 
         url = url[:-1] if url[-1] == '&' else url
             
-        result = requests.get(url, headers = self.__headers)
-        if result.ok:
-            raw_data = json.loads(result.content)['monitors']
-            new_monitors = [HTTPMonitor(x, {'tenant' : self.tenant,'headers' : self.__headers}, False) if x['type'] == 'HTTP' else BrowserMonitor(x, {'tenant' : self.tenant,'headers' : self.__headers}, False) for x in raw_data]
+        ok, data = get_json({'headers' : self.__headers, 'flight' : self.__flight}, url)
+        if ok:
+            raw_data = data['monitors']
+            new_monitors = [HTTPMonitor(x, {'tenant' : self.tenant,'headers' : self.__headers, 'flight' : self.__flight}, False) if x['type'] == 'HTTP' else BrowserMonitor(x, {'tenant' : self.tenant,'headers' : self.__headers, 'flight' : self.__flight}, False) for x in raw_data]
             if detailed: [x.get_details() for x in new_monitors]
             return new_monitors
         else:
             raise Exception("Fetch failed.")
+
+    def get_execution_batch(self, batchId:str):
+        """Returns the status of a batch of on-demand executions triggered by execute()"""
+        url = self.tenant + f'/api/v2/synthetic/executions/batch/{batchId}'
+        ok, data = get_json({'headers' : self.__headers, 'flight' : self.__flight}, url)
+        if ok:
+            return data
+        else:
+            raise Exception(data)
+
+    def request_stats(self):
+        """Returns how many GET requests went over the network and how many were served by sharing a concurrent identical request"""
+        return self.__flight.stats()
         
     def __handle_management_zone(self, managementZone:int):
         query_string = ''
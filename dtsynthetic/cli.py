@@ -0,0 +1,261 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+from dtsynthetic.base import SyntheticAPI
+from dtsynthetic.parallel import bounded_map, RateLimiter
+from dtsynthetic.snapshot import open_snapshot, read_snapshot
+
+class Runner:
+
+    """Runs one operation per input item on the parallel engine, streams the results as JSON lines and keeps throughput counters
+    Failure records go to errors when it is set, otherwise they are written to output along with the rest.
+    """
+
+    def __init__(self, api:SyntheticAPI, args, output=None, errors=None):
+        self.api = api
+        self.args = args
+        self.output = output or sys.stdout
+        self.errors = errors
+        self.limiter = RateLimiter(args.rate_limit) if args.rate_limit else None
+        self.processed = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self.__last_progress = self.started
+
+    def run(self, fn, items):
+        """fn takes one item and returns a record to write, records carrying an "error" key count as failures"""
+        def guarded(item):
+            try:
+                return fn(item)
+            except Exception as e:
+                # The API raises with the raw response body, which is bytes
+                return {'entityId' : _entity_id(item), 'error' : _message(e.args[0] if len(e.args) == 1 else e)}
+
+        for record in bounded_map(guarded, items, self.args.concurrency, limiter=self.limiter):
+            self.write(record)
+
+    def write(self, record:dict):
+        self.processed += 1
+        if 'error' in record: self.failed += 1
+        stream = self.errors if 'error' in record and self.errors is not None else self.output
+        stream.write(json.dumps(record) + '\n')
+        self.progress()
+
+    def progress(self):
+        now = time.monotonic()
+        if sys.stderr.isatty() and now - self.__last_progress >= 1:
+            self.__last_progress = now
+            sys.stderr.write(f'\r{self.processed} processed, {self.failed} failed ({self.processed / (now - self.started):.1f}/s)')
+            sys.stderr.flush()
+
+    def summary(self):
+        elapsed = time.monotonic() - self.started
+        stats = self.api.request_stats()
+        if sys.stderr.isatty(): sys.stderr.write('\n')
+        sys.stderr.write(
+            f'{self.args.command}: {self.processed} processed, {self.processed - self.failed} ok, {self.failed} failed '
+            f'in {elapsed:.1f}s ({self.processed / elapsed if elapsed else 0:.1f}/s), '
+            f'{stats["calls"]} reads, {stats["shared"]} shared{" (dry run)" if self.args.dry_run else ""}\n'
+        )
+
+def _entity_id(item):
+    # Items are monitor dicts, monitor objects or bare entityIds
+    if isinstance(item, dict): return item.get('entityId')
+    return getattr(item, 'entityId', item)
+
+def _message(value):
+    return value.decode(errors='replace') if isinstance(value, bytes) else str(value)
+
+def _read_input(stream):
+    """Yields the items piped in on stdin, either JSON objects or bare entityIds one per line"""
+    for line in stream:
+        line = line.strip()
+        if not line: continue
+        yield json.loads(line) if line.startswith('{') else line
+
+def _params(args):
+    params = {}
+    if args.tag: params['tags'] = args.tag
+    if args.type: params['type'] = args.type
+    if args.location: params['location'] = args.location
+    if args.enabled is not None: params['enabled'] = args.enabled
+    if args.management_zone is not None: params['managementZone'] = args.management_zone
+    if args.credential_id: params['credentialId'] = args.credential_id
+    return params
+
+def _detailed(runner:Runner, item):
+    return runner.api.get_monitor(_entity_id(item), detailed=True)
+
+def _update_record(result:dict):
+    record = {'entityId' : result['entityId'], 'status' : result['status']}
+    if result['status'] != 204: record['error'] = _message(result['message'])
+    return record
+
+def list_command(runner:Runner, args):
+    for monitor in runner.api.get_monitors(_params(args)):
+        runner.write(monitor.data())
+
+def hydrate_command(runner:Runner, args):
+    runner.run(lambda x: _detailed(runner, x).data(), _read_input(sys.stdin))
+
+def export_command(runner:Runner, args):
+    def hydrate(monitor):
+        result = runner.api.hydrate(monitor)
+        if result['status'] != 200: return {'entityId' : result['entityId'], 'error' : result['message']}
+        return result['data']
+
+    # Only monitors go into the snapshot, failures are reported on stderr so the file can be imported as is
+    runner.errors = sys.stderr
+    if args.path != '-': runner.output = open_snapshot(args.path, 'w')
+    try:
+        runner.run(hydrate, runner.api.get_monitors(_params(args)))
+    finally:
+        if args.path != '-':
+            runner.output.close()
+            runner.output = sys.stdout
+
+def import_command(runner:Runner, args):
+    monitors = _read_input(sys.stdin) if args.path == '-' else read_snapshot(args.path)
+    existing = {x.entityId for x in runner.api.get_monitors()}
+
+    def plan(item):
+        if not isinstance(item, dict): raise Exception(f'Expected a monitor JSON object, got {item!r}.')
+        return {'entityId' : item.get('entityId'), 'name' : item.get('name'), 'action' : 'update' if item.get('entityId') in existing else 'create'}
+
+    def restore(item):
+        result = runner.api.restore(item, existing)
+        if result['status'] in (201, 204): return {'entityId' : result['entityId'], 'status' : result['status']}
+        return _update_record(result)
+
+    runner.run(plan if args.dry_run else restore, monitors)
+
+def tag_command(runner:Runner, args):
+    def tag(item):
+        monitor = _detailed(runner, item)
+        for x in args.add:
+            key, _, value = x.partition('=')
+            monitor.add_tag(key, value or None)
+        for key in args.remove:
+            monitor.remove_tag(key)
+        if args.dry_run: return {'entityId' : monitor.entityId, 'tags' : monitor.tags}
+        return _update_record(monitor.update())
+
+    runner.run(tag, _read_input(sys.stdin))
+
+def enabled_command(runner:Runner, args):
+    enable = args.command == 'enable'
+
+    def toggle(item):
+        monitor = _detailed(runner, item)
+        if args.dry_run: return {'entityId' : monitor.entityId, 'enabled' : monitor.enabled, 'target' : enable}
+        return _update_record(monitor.enable() if enable else monitor.disable())
+
+    runner.run(toggle, _read_input(sys.stdin))
+
+def execute_command(runner:Runner, args):
+    params = {'executionCount' : args.count}
+    if args.processing_mode: params['processingMode'] = args.processing_mode
+    if args.execution_location: params['locations'] = args.execution_location
+
+    def execute(item):
+        # Disabled monitors are enabled for the duration of the execution, which needs their details
+        monitor = runner.api.get_monitor(_entity_id(item), detailed=True)
+        if args.dry_run: return {'entityId' : monitor.entityId, 'action' : 'execute', 'enabled' : monitor.enabled}
+        result = monitor.execute(params)
+        record = {'entityId' : monitor.entityId, 'batchId' : result.get('batchId'), 'result' : result}
+        if not result.get('batchId'): record['error'] = result
+        return record
+
+    runner.run(execute, _read_input(sys.stdin))
+
+def wait_command(runner:Runner, args):
+    batches = []
+    for item in _read_input(sys.stdin):
+        batchId = item.get('batchId') if isinstance(item, dict) else item
+        if batchId and batchId not in batches: batches.append(batchId)
+
+    def wait(batchId):
+        deadline = time.monotonic() + args.timeout
+        while True:
+            batch = runner.api.get_execution_batch(batchId)
+            if batch.get('batchStatus') != 'RUNNING':
+                record = {'batchId' : batchId, 'batchStatus' : batch.get('batchStatus'), 'result' : batch}
+                if batch.get('batchStatus') != 'SUCCESS': record['error'] = batch.get('batchStatus')
+                return record
+            if time.monotonic() > deadline:
+                return {'batchId' : batchId, 'batchStatus' : 'RUNNING', 'error' : 'Timed out waiting for the batch to finish.'}
+            time.sleep(args.interval)
+
+    runner.run(wait, batches)
+
+def _add_filters(parser):
+    parser.add_argument('--tag', action='append', help='Only monitors with this tag, as key or key:value. Repeatable')
+    parser.add_argument('--type', choices=['HTTP', 'BROWSER'])
+    parser.add_argument('--location', help='Only monitors assigned to this location entityId')
+    parser.add_argument('--enabled', dest='enabled', action='store_true', default=None)
+    parser.add_argument('--disabled', dest='enabled', action='store_false')
+    parser.add_argument('--management-zone', type=int)
+    parser.add_argument('--credential-id')
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='dtsynthetic', description='Bulk operations on Dynatrace synthetic monitors. Commands that act on monitors read entityIds or monitor JSON lines on stdin and write JSON lines to stdout.')
+    parser.add_argument('--tenant', default=os.environ.get('DT_TENANT'), help='Tenant url, defaults to $DT_TENANT')
+    parser.add_argument('--token', default=os.environ.get('DT_API_TOKEN'), help='API token, defaults to $DT_API_TOKEN')
+    parser.add_argument('-j', '--concurrency', type=int, default=8, help='Number of monitors processed at once')
+    parser.add_argument('--rate-limit', type=float, help='Maximum number of monitors started per second')
+    parser.add_argument('--dry-run', action='store_true', help='Read and report what would change without writing anything')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    command = commands.add_parser('list', help='List monitor summaries')
+    _add_filters(command)
+    command.set_defaults(func=list_command)
+
+    command = commands.add_parser('hydrate', help='Fetch full details of the monitors on stdin')
+    command.set_defaults(func=hydrate_command)
+
+    command = commands.add_parser('export', help='Write fully detailed monitors as JSON lines')
+    command.add_argument('path', nargs='?', default='-', help='Output file, gzip compressed if it ends in ".gz". Defaults to stdout')
+    _add_filters(command)
+    command.set_defaults(func=export_command)
+
+    command = commands.add_parser('import', help='Create or update monitors from JSON lines')
+    command.add_argument('path', nargs='?', default='-', help='Input file written by export, gzip compressed if it ends in ".gz". Defaults to stdin')
+    command.set_defaults(func=import_command)
+
+    command = commands.add_parser('tag', help='Add or remove tags on the monitors on stdin')
+    command.add_argument('--add', action='append', default=[], metavar='KEY[=VALUE]')
+    command.add_argument('--remove', action='append', default=[], metavar='KEY')
+    command.set_defaults(func=tag_command)
+
+    for name in ('enable', 'disable'):
+        command = commands.add_parser(name, help=f'{name.capitalize()} the monitors on stdin')
+        command.set_defaults(func=enabled_command)
+
+    command = commands.add_parser('execute', help='Trigger on-demand executions of the monitors on stdin')
+    command.add_argument('--count', type=int, default=1, help='Executions per monitor')
+    command.add_argument('--processing-mode', choices=['STANDARD', 'EXECUTIONS_DETAILS_ONLY', 'DISABLE_PROBLEM_DETECTION'])
+    command.add_argument('--execution-location', action='append', help='Location entityId to execute from. Repeatable')
+    command.set_defaults(func=execute_command)
+
+    command = commands.add_parser('wait', help='Wait for the execution batches on stdin to finish')
+    command.add_argument('--timeout', type=float, default=600, help='Seconds to wait for each batch')
+    command.add_argument('--interval', type=float, default=5, help='Seconds between status checks')
+    command.set_defaults(func=wait_command)
+
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.tenant or not args.token: parser.error('A tenant and token are required, pass --tenant and --token or set DT_TENANT and DT_API_TOKEN.')
+
+    runner = Runner(SyntheticAPI(args.tenant, args.token), args)
+    try:
+        args.func(runner, args)
+    finally:
+        runner.output.flush()
+        runner.summary()
+    return 1 if runner.failed else 0
@@ -0,0 +1,183 @@
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+from dtsynthetic.snapshot import read_snapshot
+
+IGNORED_KEYS = {'description'}
+
+class DuplicateIndex:
+
+    """A content hash index over monitor scripts for finding monitors that run the same requests or events
+    Steps are normalized before hashing, descriptions are ignored and keys are sorted, so cosmetic differences do not hide a duplicate.
+    :param monitors: Detailed monitors, draft monitors, monitor dicts, or the path of a snapshot written by SyntheticAPI.export_jsonl
+    :param num_perm: Number of MinHash permutations used for near-duplicate detection
+    """
+
+    def __init__(self, monitors, num_perm:int=64):
+        if isinstance(monitors, str): monitors = read_snapshot(monitors)
+        self.num_perm = num_perm
+        self.entityIds = []
+        self.names = []
+        self.rates = []
+        self.steps = []
+        self.__normalized = []
+        for monitor in monitors:
+            record = _record(monitor)
+            if record is None: continue
+            entityId, name, rate, normalized = record
+            self.entityIds.append(entityId)
+            self.names.append(name)
+            self.rates.append(rate)
+            self.steps.append([json.dumps(x, sort_keys=True) for x in normalized])
+            self.__normalized.append(normalized)
+        self.rates = np.array(self.rates, dtype=float)
+        self.__signatures = None
+
+    def clusters(self, mode:str='exact', threshold:float=0.8):
+        """Groups of two or more monitors with the same script, as lists of positions in the index
+        :param mode: "exact" compares steps in order, "unordered" ignores the order of steps, "near" finds scripts whose estimated similarity is at least threshold
+        Near-duplicate similarity is the Jaccard similarity of the scripts' shingles, one shingle per distinct field and value found in any step, estimated with MinHash.
+        """
+        if mode == 'exact':
+            return self.__group([hashlib.blake2b('\n'.join(x).encode(), digest_size=16).digest() for x in self.steps])
+        elif mode == 'unordered':
+            return self.__group([hashlib.blake2b('\n'.join(sorted(x)).encode(), digest_size=16).digest() for x in self.steps])
+        elif mode == 'near':
+            return self.__near_clusters(threshold)
+        else:
+            raise Exception('Invalid mode. Use "exact", "unordered" or "near".')
+
+    def report(self, mode:str='exact', threshold:float=0.8):
+        """One row per duplicate cluster with what merging it into a single monitor would save
+        The monitor with the highest execution rate is kept, the executions of every other member are counted as saved.
+        """
+        rows = []
+        for cluster in self.clusters(mode, threshold):
+            rates = self.rates[cluster]
+            keep = cluster[int(np.argmax(rates))]
+            saved = float(rates.sum() - rates.max())
+            rows.append({
+                'keep' : self.entityIds[keep],
+                'duplicates' : [self.entityIds[x] for x in cluster if x != keep],
+                'names' : [self.names[x] for x in cluster],
+                'size' : len(cluster),
+                'saved_per_minute' : saved,
+                'saved_per_day' : saved * 1440
+            })
+        columns = ['keep', 'duplicates', 'names', 'size', 'saved_per_minute', 'saved_per_day']
+        return pd.DataFrame(rows, columns=columns).sort_values('saved_per_minute', ascending=False, ignore_index=True)
+
+    def __group(self, keys:list):
+        groups = {}
+        for i, key in enumerate(keys):
+            groups.setdefault(key, []).append(i)
+        return [x for x in groups.values() if len(x) > 1]
+
+    def __near_clusters(self, threshold:float):
+        signatures = self.__minhash()
+        parent = np.arange(len(self.steps))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        def union(pairs):
+            for x, y in pairs:
+                x, y = find(x), find(y)
+                if x != y: parent[max(x, y)] = min(x, y)
+
+        # Identical scripts always collide, so only one representative of each takes part in the banding
+        exact = self.clusters('exact')
+        union((cluster[0], x) for cluster in exact for x in cluster[1:])
+        representatives = np.setdiff1d(np.arange(len(self.steps)), [x for cluster in exact for x in cluster[1:]])
+        reduced = signatures[representatives]
+
+        rows = max(1, min(4, self.num_perm))
+        mixer = np.random.default_rng(1).integers(1, 1 << 63, rows, dtype=np.uint64) | np.uint64(1)
+        with np.errstate(over='ignore'):
+            for start in range(0, self.num_perm - rows + 1, rows):
+                keys = (reduced[:, start:start + rows] * mixer).sum(axis=1)
+                order = np.argsort(keys, kind='stable')
+                sorted_keys = keys[order]
+                first = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+                # Compare every member of a bucket with the bucket's first member
+                heads = order[np.maximum.accumulate(np.where(first, np.arange(len(order)), 0))]
+                members = order[~first]
+                heads = heads[~first]
+                similar = (reduced[members] == reduced[heads]).mean(axis=1) >= threshold
+                union(zip(representatives[members[similar]].tolist(), representatives[heads[similar]].tolist()))
+
+        groups = {}
+        for i in range(len(parent)):
+            groups.setdefault(find(i), []).append(i)
+        return [x for x in groups.values() if len(x) > 1]
+
+    def __minhash(self):
+        if self.__signatures is not None: return self.__signatures
+        shingles = [self.__shingles(x) for x in self.__normalized]
+        lengths = np.array([len(x) for x in shingles])
+        values = np.fromiter((y for x in shingles for y in x), dtype=np.uint64, count=int(lengths.sum()))
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])) if len(lengths) else np.zeros(0, dtype=int)
+        rng = np.random.default_rng(0)
+        a = rng.integers(1, 1 << 63, self.num_perm, dtype=np.uint64) | np.uint64(1)
+        b = rng.integers(0, 1 << 63, self.num_perm, dtype=np.uint64)
+        signatures = np.empty((len(self.steps), self.num_perm), dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for i in range(self.num_perm):
+                # Multiply-shift universal hashing, uint64 wraparound is intended
+                hashed = values * a[i] + b[i]
+                signatures[:, i] = np.minimum.reduceat(hashed, offsets) if len(values) else 0
+        self.__signatures = signatures
+        return signatures
+
+    def __shingles(self, steps:list):
+        # blake2b rather than hash(), whose string hashing is randomized per process, so signatures are the same on every run
+        return list({int.from_bytes(hashlib.blake2b(repr(x).encode(), digest_size=8).digest(), 'little') for step in steps for x in _leaves(step)})
+
+def _normalize(value):
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items() if k not in IGNORED_KEYS and v is not None}
+    elif isinstance(value, list):
+        return [_normalize(x) for x in value]
+    return value
+
+def _leaves(value, path:str=''):
+    if isinstance(value, dict):
+        for k, v in value.items():
+            yield from _leaves(v, f'{path}.{k}')
+    elif isinstance(value, list):
+        for v in value:
+            yield from _leaves(v, path + '[]')
+    else:
+        yield (path, value)
+
+def _steps(script:dict):
+    if 'requests' in script:
+        steps = script['requests']
+    else:
+        steps = script.get('events', [])
+    return [_normalize(x) for x in steps]
+
+def _record(monitor):
+    if isinstance(monitor, dict):
+        data = monitor
+        script = data.get('script')
+    else:
+        data = vars(monitor)
+        script = getattr(monitor, 'script', None)
+        if hasattr(script, 'data'):
+            script = script.data()
+        elif script is not None:
+            script = monitor.data()['script']
+    if not script: return None
+
+    entityId = data.get('entityId', getattr(monitor, 'entityId', None))
+    name = data.get('name', getattr(monitor, 'name', None))
+    frequency = data.get('frequencyMin') or 0
+    enabled = data.get('enabled', True)
+    rate = len(data.get('locations') or []) / frequency if enabled and frequency else 0.0
+    return entityId, name, rate, _steps(script)
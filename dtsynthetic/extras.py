@@ -9,7 +9,8 @@ class HTTPRequest:
             self.validation = request['validation'] if 'validation' in request else None
             self.configuration = request['configuration'] if 'configuration' in request else None
             self.preProcessingScript = request['preProcessingScript'] if 'preProcessingScript' in request else ""
-            self.postProcessingScript = request['__postProcessingScript'] if '__postProcessingScript' in request else ""
+            self.postProcessingScript = request['postProcessingScript'] if 'postProcessingScript' in request else ""
+            if 'authentication' in request: self.authentication = request['authentication']
 
         def data(self):
             body = {
@@ -23,6 +24,8 @@ class HTTPRequest:
             }
             if hasattr(self,'requestBody'):
                 body['requestBody'] = self.requestBody
+            if hasattr(self,'authentication'):
+                body['authentication'] = self.authentication
             return body
 
 class NavigateEvent:
@@ -54,7 +57,7 @@ class JavaScriptEvent:
     def __init__(self, event):
         if 'type' in event: self.type = event['type']
         if 'description' in event: self.description = event['description']
-        if 'javaScript' in event: self.javascript = event['javaScript']
+        if 'javaScript' in event: self.javaScript = event['javaScript']
         if 'wait' in event: self.wait = event['wait']
         if 'target' in event: self.target = event['target']
     
@@ -89,6 +92,7 @@ class KeystrokesEvent:
         if 'textValue' in event: self.textValue = event['textValue']
         if 'masked' in event: self.masked = event['masked']
         if 'simulateBlurEvent' in event: self.simulateBlurEvent = event['simulateBlurEvent']
+        if 'credential' in event: self.credential = event['credential']
         if 'wait' in event: self.wait = event['wait']
         if 'validate' in event: self.validate = event['validate']
         if 'target' in event: self.target = event['target']
@@ -124,13 +128,27 @@ class HTTPScript:
         self.requests.append(HTTPRequest(new_request))
 
 class BrowserScript:
-    def __init__(self, type, version, events):
+    def __init__(self, type, version, events, configuration=None):
         self.type = type
         self.version = version
         self.events = events
+        self.configuration = configuration
     def data(self):
-        return {
+        body = {
             'type' : self.type,
             'version' : self.version,
             'events' : [x.data() for x in self.events]
-        }  
\ No newline at end of file
+        }
+        if self.configuration is not None:
+            body['configuration'] = self.configuration
+        return body
+
+EVENT_CLASSES = {
+    'navigate' : NavigateEvent,
+    'click' : InteractionEvent,
+    'tap' : InteractionEvent,
+    'javascript' : JavaScriptEvent,
+    'cookie' : CookieEvent,
+    'keystrokes' : KeystrokesEvent,
+    'selectOption' : SelectOptionEvent
+}
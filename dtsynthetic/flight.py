@@ -0,0 +1,87 @@
+import requests
+import json
+import copy
+import threading
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+
+    """Coalesces concurrent identical requests so that only one of them goes over the network.
+    The first caller for a key performs the request, every caller arriving while it is in flight waits for and shares its parsed result.
+    Waiting callers receive a deep copy of the result so they are free to mutate the monitors built from it.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__in_flight = {}
+        self.calls = 0
+        self.shared = 0
+
+    def __deepcopy__(self, memo):
+        # Shared between every monitor of a SyntheticAPI, so it is never copied along with their request_data
+        return self
+
+    def do(self, key, fn):
+        with self.__lock:
+            call = self.__in_flight.get(key)
+            if call:
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self.__in_flight[key] = call
+                self.calls += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                # Each waiter raises its own exception, re-raising the shared one from several threads would tangle its traceback
+                raise Exception(f'Shared request for {key} failed: {call.error}') from call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            # KeyboardInterrupt and friends included, otherwise waiters would be released with no result and no error
+            call.error = e
+            raise
+        finally:
+            with self.__lock:
+                del self.__in_flight[key]
+                waiters = call.waiters
+            if call.error is None and waiters:
+                # Snapshot before handing the result back, the leader may start mutating it straight away
+                call.result = copy.deepcopy(result)
+            call.done.set()
+        return result
+
+    def stats(self):
+        return {
+            'calls' : self.calls,
+            'shared' : self.shared,
+            'in_flight' : len(self.__in_flight)
+        }
+
+def get_json(request_data:dict, url:str):
+    """GET a url, coalescing with any identical request in flight when request_data carries a SingleFlight.
+    Returns a tuple of (ok, payload) where payload is the parsed json body on success and the raw content otherwise.
+    """
+    def fetch():
+        result = requests.get(url, headers = request_data['headers'])
+        if result.ok:
+            return (True, json.loads(result.content))
+        else:
+            return (False, result.content)
+
+    flight = request_data.get('flight')
+    if flight is None:
+        return fetch()
+    return flight.do(url, fetch)
@@ -2,7 +2,8 @@ import requests
 import json
 import copy
 
-from dtsynthetic.extras import HTTPRequest, KeystrokesEvent, NavigateEvent, CookieEvent, JavaScriptEvent, SelectOptionEvent, InteractionEvent, HTTPScript, BrowserScript
+from dtsynthetic.flight import get_json
+from dtsynthetic.extras import HTTPRequest, HTTPScript, BrowserScript, EVENT_CLASSES
 
 class DraftHTTPMonitor:
     def __init__(self, data:dict, request_data:dict):
@@ -60,6 +61,8 @@ class DraftBrowserMonitor:
         if 'anomalyDetection' in data: self.anomalyDetection = data['anomalyDetection']
         if 'keyPerformanceMetrics' in data: self.keyPerformanceMetrics = data['keyPerformanceMetrics']
         else: self.keyPerformanceMetrics = {"loadActionKpm": "VISUALLY_COMPLETE","xhrActionKpm": "VISUALLY_COMPLETE"}
+        if 'manuallyAssignedApps' in data: self.manuallyAssignedApps = data['manuallyAssignedApps']
+        else: self.manuallyAssignedApps = []
         if 'tags' in data: self.tags = data['tags']
         else: self.tags = []
         if 'configuration' in data['script']: self.script['configuration'] = data['script']['configuration']
@@ -84,19 +87,8 @@ class DraftBrowserMonitor:
         return x
     
     def __classifyEvent(self, event:dict):
-
-        if event['type'] == 'navigate':
-            return NavigateEvent(event)
-        elif event['type'] == 'click' or event['type'] == 'tap':
-            return InteractionEvent(event)
-        elif event['type'] == 'javascript':
-            return JavaScriptEvent(event)
-        elif event['type'] == 'cookie':
-            return CookieEvent(event)
-        elif event['type'] == 'keystrokes':
-            return KeystrokesEvent(event)
-        elif event['type'] == 'selectOption':
-            return SelectOptionEvent(event)
+        if event['type'] in EVENT_CLASSES:
+            return EVENT_CLASSES[event['type']](event)
         else: raise Exception(event)
     
     def create(self):
@@ -122,6 +114,7 @@ class HTTPMonitor:
         if 'anomalyDetection' in data: self.anomalyDetection = data['anomalyDetection']
         if 'managementZones' in data: self.managementZones = data['managementZones']
         if 'automaticallyAssignedApps' in data: self.automaticallyAssignedApps = data['automaticallyAssignedApps']
+        if 'manuallyAssignedApps' in data: self.manuallyAssignedApps = data['manuallyAssignedApps']
         if 'frequencyMin' in data: self.frequencyMin = data['frequencyMin']
         if 'tags' in data: self.tags = data['tags']
         self.is_detailed = detailed
@@ -136,9 +129,8 @@ class HTTPMonitor:
 
     def get_details(self):
         url = self._request_data['tenant'] + f'/api/v1/synthetic/monitors/{self.entityId}'
-        result = requests.get(url, headers = self._request_data['headers'])
-        if result.ok:
-            data = json.loads(result.content)
+        ok, data = get_json(self._request_data, url)
+        if ok:
             self.createdFrom = data['createdFrom']
             self.script = HTTPScript(data['script']['version'],[HTTPRequest(x) for x in data['script']['requests']])
             self.locations = data['locations']
@@ -267,11 +259,12 @@ class BrowserMonitor:
         self.type = data['type']
         self._request_data = request_data
         if 'createdFrom' in data: self.createdFrom = data['createdFrom']
-        if 'script' in data: self.script = BrowserScript(data['script']['type'],data['script']['version'],[self.__classifyEvent(x) for x in data['script']['events']])
+        if 'script' in data: self.script = BrowserScript(data['script']['type'],data['script']['version'],[self.__classifyEvent(x) for x in data['script']['events']],data['script'].get('configuration'))
         if 'locations' in data: self.locations = data['locations']
         if 'anomalyDetection' in data: self.anomalyDetection = data['anomalyDetection']
         if 'managementZones' in data: self.managementZones = data['managementZones']
         if 'automaticallyAssignedApps' in data: self.automaticallyAssignedApps = data['automaticallyAssignedApps']
+        if 'manuallyAssignedApps' in data: self.manuallyAssignedApps = data['manuallyAssignedApps']
         if 'frequencyMin' in data: self.frequencyMin = data['frequencyMin']
         if 'keyPerformanceMetrics' in data: self.keyPerformanceMetrics = data['keyPerformanceMetrics']
         if 'tags' in data: self.tags = data['tags']
@@ -338,19 +331,8 @@ class BrowserMonitor:
         return y
     
     def __classifyEvent(self, event:dict):
-
-        if event['type'] == 'navigate':
-            return NavigateEvent(event)
-        elif event['type'] == 'click' or event['type'] == 'tap':
-            return InteractionEvent(event)
-        elif event['type'] == 'javascript':
-            return JavaScriptEvent(event)
-        elif event['type'] == 'cookie':
-            return CookieEvent(event)
-        elif event['type'] == 'keystrokes':
-            return KeystrokesEvent(event)
-        elif event['type'] == 'selectOption':
-            return SelectOptionEvent(event)
+        if event['type'] in EVENT_CLASSES:
+            return EVENT_CLASSES[event['type']](event)
         else: raise Exception(event)
 
     def update(self):
@@ -363,14 +345,14 @@ class BrowserMonitor:
         
     def get_details(self):
         url = self._request_data['tenant'] + f'/api/v1/synthetic/monitors/{self.entityId}'
-        result = requests.get(url, headers = self._request_data['headers'])
-        if result.ok:
-            data = json.loads(result.content)
+        ok, data = get_json(self._request_data, url)
+        if ok:
             self.createdFrom = data['createdFrom']
             self.script = BrowserScript(
                 data['script']['type'],
                 data['script']['version'],
-                [self.__classifyEvent(x) for x in data['script']['events']]
+                [self.__classifyEvent(x) for x in data['script']['events']],
+                data['script'].get('configuration')
             )
             self.locations = data['locations']
             self.anomalyDetection = data['anomalyDetection']
@@ -0,0 +1,42 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+
+class RateLimiter:
+
+    """Spaces calls out evenly so that no more than `rate` start per second, across every thread sharing the limiter
+    :param rate: Maximum number of calls per second
+    """
+
+    def __init__(self, rate:float):
+        self.interval = 1.0 / rate
+        self.__next = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def acquire(self):
+        with self.__lock:
+            now = time.monotonic()
+            wait = self.__next - now
+            self.__next = max(self.__next, now) + self.interval
+        if wait > 0: time.sleep(wait)
+
+def bounded_map(fn, iterable, workers:int=8, window:int=None, limiter:RateLimiter=None):
+    """Like ThreadPoolExecutor.map, but pulls from the iterable lazily and keeps at most `window` items in flight.
+    Results are yielded in input order, so large inputs can be streamed without holding them all in memory.
+    When a limiter is given every call to fn waits for it first.
+    """
+    window = window or workers * 4
+    task = fn
+    if limiter:
+        def task(item):
+            limiter.acquire()
+            return fn(item)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for item in iterable:
+            pending.append(executor.submit(task, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
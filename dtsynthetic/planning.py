@@ -0,0 +1,128 @@
+import heapq
+import numpy as np
+import pandas as pd
+
+from dtsynthetic.validation import VALID_FREQUENCIES
+from dtsynthetic.snapshot import read_snapshot
+
+FIELDS = ('entityId', 'name', 'type', 'enabled', 'frequencyMin', 'locations')
+
+class LoadPlanner:
+
+    """Works out how many executions per minute a collection of monitors puts on each synthetic location
+    :param monitors: Detailed monitors, monitor dicts, or the path of a snapshot written by SyntheticAPI.export_jsonl
+    """
+
+    def __init__(self, monitors):
+        if isinstance(monitors, str): monitors = read_snapshot(monitors)
+        records = [_record(x) for x in monitors]
+        self.monitors = pd.DataFrame(records, columns=FIELDS).set_index('entityId', drop=False)
+        self.monitors['rate'] = _rate(self.monitors['frequencyMin'].to_numpy(dtype=float))
+        self.monitors.loc[~self.monitors['enabled'].astype(bool), 'rate'] = 0.0
+        self.executions = self.monitors.explode('locations').rename(columns={'locations' : 'location'}).dropna(subset=['location'])
+
+    def location_load(self):
+        """Executions per minute on each location, split into HTTP and browser executions"""
+        load = self.executions.pivot_table(index='location', columns='type', values='rate', aggfunc='sum', fill_value=0.0)
+        for column in ('HTTP', 'BROWSER'):
+            if column not in load: load[column] = 0.0
+        load = load[['HTTP', 'BROWSER']]
+        load['total'] = load['HTTP'] + load['BROWSER']
+        load['browser_share'] = np.divide(load['BROWSER'], load['total'], out=np.zeros(len(load)), where=load['total'].to_numpy() > 0)
+        return load.sort_values('total', ascending=False)
+
+    def bucketed_load(self, bucket:int=1, horizon:int=240):
+        """Executions started per location in each time bucket, assuming every monitor first runs at minute zero
+        :param bucket: Width of a bucket in minutes
+        :param horizon: Number of minutes to cover, the default spans every frequency the API accepts
+        """
+        executions = self.executions[self.executions['rate'] > 0]
+        minutes = np.arange(horizon)
+        frequency = executions['frequencyMin'].to_numpy(dtype=int)
+        runs = (minutes[None, :] % frequency[:, None] == 0).astype(np.int64)
+        buckets = np.add.reduceat(runs, np.arange(0, horizon, bucket), axis=1)
+        load = pd.DataFrame(buckets, index=executions['location'].to_numpy(), columns=np.arange(0, horizon, bucket))
+        return load.groupby(level=0).sum()
+
+    def plan(self, capacity, alternatives:dict={}):
+        """Suggests frequency and location changes that bring every location under its capacity budget
+        The busiest monitor on an overloaded location is handled first, repeatedly, so cuts are spread over several monitors. It is moved to an alternative location with spare capacity when one is given, otherwise its frequency is lowered by one allowed step. Monitors that were moved are never slowed down.
+        :param capacity: Executions per minute allowed on every location, or a dict of location to executions per minute (locations left out are not limited)
+        :param alternatives: Dict of location to the locations its monitors may be moved to
+        """
+        load = self.executions.groupby('location')['rate'].sum().to_dict()
+        limit = (lambda x: capacity.get(x, np.inf)) if isinstance(capacity, dict) else (lambda x: capacity)
+        frequencies = sorted(x for x in VALID_FREQUENCIES if x > 0)
+        current = {x : {'frequencyMin' : f, 'locations' : list(l), 'rate' : r} for x, f, l, r in zip(self.monitors['entityId'], self.monitors['frequencyMin'], self.monitors['locations'], self.monitors['rate'])}
+        changed = set()
+        moved = set()
+
+        for location in sorted(load, key=lambda x: load[x] - limit(x), reverse=True):
+            if load[location] <= limit(location): continue
+            on_location = self.executions[(self.executions['location'] == location) & (self.executions['rate'] > 0)]
+            queue = [(-current[x]['rate'], x) for x in on_location['entityId'] if x not in moved]
+            heapq.heapify(queue)
+
+            while queue and load[location] > limit(location) + 1e-9:
+                rate, entityId = heapq.heappop(queue)
+                monitor = current[entityId]
+                # Entries left behind by an earlier change of the same monitor are skipped
+                if -rate != monitor['rate'] or location not in monitor['locations'] or entityId in moved: continue
+                rate = monitor['rate']
+
+                target = next((x for x in alternatives.get(location, []) if x not in monitor['locations'] and load.get(x, 0.0) + rate <= limit(x)), None)
+                if target:
+                    monitor['locations'][monitor['locations'].index(location)] = target
+                    load[location] -= rate
+                    load[target] = load.get(target, 0.0) + rate
+                    moved.add(entityId)
+                else:
+                    frequency = next((x for x in frequencies if x > monitor['frequencyMin']), None)
+                    if frequency is None: continue
+                    for x in monitor['locations']:
+                        load[x] -= rate - 1 / frequency
+                    monitor['frequencyMin'] = frequency
+                    monitor['rate'] = 1 / frequency
+                    heapq.heappush(queue, (-monitor['rate'], entityId))
+                changed.add(entityId)
+
+        changes = {x : {'frequencyMin' : int(current[x]['frequencyMin']), 'locations' : current[x]['locations']} for x in changed}
+        overloaded = sorted(x for x in load if load[x] > limit(x) + 1e-9)
+        return LoadPlan(changes, self.location_load()['total'], pd.Series(load, name='total'), overloaded)
+
+class LoadPlan:
+
+    """Frequency and location changes suggested by LoadPlanner.plan
+    :param changes: Dict of entityId to the new frequencyMin and locations for that monitor
+    :param before: Executions per minute on each location before the changes
+    :param after: Executions per minute on each location after the changes
+    :param overloaded: Locations still over capacity after the changes
+    """
+
+    def __init__(self, changes:dict, before:pd.Series, after:pd.Series, overloaded:list):
+        self.changes = changes
+        self.before = before
+        self.after = after
+        self.overloaded = overloaded
+
+    def summary(self):
+        return pd.DataFrame({'before' : self.before, 'after' : self.after}).fillna(0.0).sort_values('after', ascending=False)
+
+    def apply(self, monitors:list):
+        """Applies the changes to detailed monitors and returns the ones that changed, ready to be passed to SyntheticAPI.update"""
+        updated = []
+        for monitor in monitors:
+            if monitor.entityId not in self.changes: continue
+            if not monitor.is_detailed: raise Exception('Call get_details() before attempting to edit a script')
+            monitor.frequencyMin = self.changes[monitor.entityId]['frequencyMin']
+            monitor.locations = list(self.changes[monitor.entityId]['locations'])
+            updated.append(monitor)
+        return updated
+
+def _rate(frequency:np.ndarray):
+    frequency = np.nan_to_num(frequency, nan=0.0)
+    return np.divide(1.0, frequency, out=np.zeros_like(frequency), where=frequency > 0)
+
+def _record(monitor):
+    get = monitor.get if isinstance(monitor, dict) else lambda x: getattr(monitor, x, None)
+    return tuple(get(x) or [] if x == 'locations' else get(x) for x in FIELDS)
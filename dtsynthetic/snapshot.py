@@ -0,0 +1,15 @@
+import json
+import gzip
+
+def open_snapshot(path:str, mode:str='r', compress:bool=None):
+    """Opens a JSON lines monitor snapshot, gzip compressed when compress is set or the path ends in ".gz" """
+    if compress is None: compress = path.endswith('.gz')
+    if compress:
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+def read_snapshot(path:str, compress:bool=None):
+    """Yields the monitor dicts of a snapshot written by SyntheticAPI.export_jsonl one at a time"""
+    with open_snapshot(path, 'r', compress) as f:
+        for line in f:
+            if line.strip(): yield json.loads(line)
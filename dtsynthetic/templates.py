@@ -0,0 +1,169 @@
+import re
+import copy
+import itertools
+import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from dtsynthetic.extras import EVENT_CLASSES
+from dtsynthetic.validation import VALID_METHODS
+
+PLACEHOLDER = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+class MonitorTemplate:
+
+    """A monitor definition containing {{placeholder}} markers that can be stamped out into many monitor dicts
+    The template is parsed and validated once, rendering a row only fills in the precompiled slots.
+    A string that is nothing but a single placeholder is replaced by the raw parameter value, so lists, numbers and booleans (e.g. locations or frequencyMin) can be parameters too.
+    Blank (NaN) values, e.g. empty csv cells, count as missing parameters.
+    :param data: A monitor dict in the same format accepted by SyntheticAPI.new_monitor
+    :type data: dict
+    :param types: Optional dict of parameter name to "list", "int", "float", "bool", "str" or a callable, applied to that parameter before rendering. "list" splits comma separated strings, so a csv cell like "L1,L2" can fill a locations placeholder. Callables must be picklable to render in a process pool
+    :type types: dict
+    """
+
+    def __init__(self, data:dict, types:dict=None):
+        self.__fields = set()
+        self.__validate(data)
+        self.__compiled = self.__compile(data)
+        self.__types = {}
+        for name, kind in (types or {}).items():
+            if name not in self.__fields: raise Exception(f'Unknown template parameter "{name}".')
+            if not callable(kind) and kind not in CONVERTERS: raise Exception(f'Invalid type for "{name}". Use one of {sorted(CONVERTERS)} or a callable.')
+            self.__types[name] = kind if callable(kind) else CONVERTERS[kind]
+
+    @property
+    def fields(self):
+        return set(self.__fields)
+
+    def render(self, params:dict):
+        missing = [x for x in self.__fields if x not in params or _is_blank(params[x])]
+        if missing: raise Exception(f'Missing template parameters: {sorted(missing)}')
+        if self.__types:
+            params = dict(params)
+            for name, convert in self.__types.items():
+                params[name] = convert(params[name])
+        return _render(self.__compiled, params)
+
+    def render_all(self, rows, processes:int=None, chunksize:int=256):
+        """Renders one monitor dict per row
+        :param rows: A path to a csv file, a DataFrame, or any iterable of dicts
+        :param processes: When set, rows are rendered in a pool of this many processes
+        :param chunksize: Number of rows sent to a process at a time, at most two chunks per process are in flight so large inputs are never read up front
+        """
+        rows = _iter_rows(rows)
+        if not processes:
+            for row in rows:
+                yield self.render(row)
+        else:
+            pending = deque()
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(self,)) as executor:
+                while True:
+                    batch = list(itertools.islice(rows, chunksize))
+                    if not batch: break
+                    pending.append(executor.submit(_render_batch, batch))
+                    if len(pending) >= processes * 2:
+                        yield from pending.popleft().result()
+                while pending:
+                    yield from pending.popleft().result()
+
+    def __validate(self, data:dict):
+        for key in ('name', 'enabled', 'type', 'script', 'locations'):
+            if key not in data: raise Exception(f'Template is missing required field "{key}".')
+        if data['type'] == 'HTTP':
+            if 'frequencyMin' not in data: raise Exception('Template is missing required field "frequencyMin".')
+            if not data['script'].get('requests'): raise Exception('HTTP template script has no requests.')
+            for i, request in enumerate(data['script']['requests']):
+                for key in ('description', 'url', 'method'):
+                    if key not in request: raise Exception(f'Template request {i} is missing required field "{key}".')
+                if _is_literal(request['method']) and request['method'] not in VALID_METHODS: raise Exception(f'Template request {i} has invalid method {request["method"]}.')
+        elif data['type'] == 'BROWSER':
+            if not data['script'].get('events'): raise Exception('Browser template script has no events.')
+            for key in ('type', 'version'):
+                if key not in data['script']: raise Exception(f'Browser template script is missing required field "{key}".')
+            for i, event in enumerate(data['script']['events']):
+                if 'type' not in event: raise Exception(f'Template event {i} has no type.')
+                if _is_literal(event['type']) and event['type'] not in EVENT_CLASSES: raise Exception(f'Template event {i} has invalid type {event["type"]}.')
+        else:
+            raise Exception('Invalid template type. Templates must be HTTP or BROWSER monitors.')
+
+    def __compile(self, value):
+        if isinstance(value, dict):
+            return ('dict', tuple((k, self.__compile(v)) for k, v in value.items()))
+        elif isinstance(value, list):
+            return ('list', tuple(self.__compile(v) for v in value))
+        elif isinstance(value, str):
+            parts = PLACEHOLDER.split(value)
+            if len(parts) == 1:
+                return ('const', value)
+            self.__fields.update(parts[1::2])
+            if len(parts) == 3 and not parts[0] and not parts[2]:
+                return ('field', parts[1])
+            return ('format', tuple(parts))
+        else:
+            return ('const', value)
+
+def _render(node, params:dict):
+    kind, value = node
+    if kind == 'const':
+        return value
+    elif kind == 'field':
+        return copy.deepcopy(params[value])
+    elif kind == 'format':
+        # Odd indices of a re.split with one group are the captured placeholder names
+        return ''.join(part if i % 2 == 0 else str(params[part]) for i, part in enumerate(value))
+    elif kind == 'dict':
+        return {k: _render(v, params) for k, v in value}
+    else:
+        return [_render(v, params) for v in value]
+
+_worker_template = None
+
+def _init_worker(template:MonitorTemplate):
+    # Ship the template to each process once instead of with every batch
+    global _worker_template
+    _worker_template = template
+
+def _render_batch(rows:list):
+    return [_worker_template.render(x) for x in rows]
+
+def _is_literal(value):
+    # Values filled in by a placeholder can only be checked once a row is rendered
+    return not (isinstance(value, str) and PLACEHOLDER.search(value))
+
+def _is_blank(value):
+    return isinstance(value, float) and value != value
+
+def _to_list(value):
+    if isinstance(value, str): return [x.strip() for x in value.split(',') if x.strip()]
+    return list(value)
+
+def _to_int(value):
+    # Strings are parsed as floats so csv cells like "5.0" are accepted, the whole number check then applies to both
+    number = float(value) if isinstance(value, str) else value
+    if isinstance(number, float) and not number.is_integer(): raise Exception(f'Expected a whole number, got {value}.')
+    return int(number)
+
+def _to_bool(value):
+    if isinstance(value, str):
+        if value.strip().lower() in ('true', 'yes', '1'): return True
+        if value.strip().lower() in ('false', 'no', '0'): return False
+        raise Exception(f'Expected a boolean, got {value}.')
+    return bool(value)
+
+CONVERTERS = {
+    'list' : _to_list,
+    'int' : _to_int,
+    'float' : float,
+    'bool' : _to_bool,
+    'str' : str
+}
+
+def _iter_rows(rows, chunksize:int=10000):
+    if isinstance(rows, str):
+        for chunk in pd.read_csv(rows, chunksize=chunksize, low_memory=False):
+            yield from chunk.to_dict('records')
+    elif isinstance(rows, pd.DataFrame):
+        yield from rows.to_dict('records')
+    else:
+        yield from rows
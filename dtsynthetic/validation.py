@@ -0,0 +1,127 @@
+import re
+import time
+import threading
+
+from dtsynthetic.flight import get_json
+from dtsynthetic.extras import EVENT_CLASSES
+
+VALID_FREQUENCIES = {0, 1, 2, 5, 10, 15, 30, 60, 120, 180, 240}
+VALID_METHODS = {'GET', 'POST', 'PUT', 'DELETE', 'HEAD', 'PATCH', 'OPTIONS'}
+CREDENTIAL_ID = re.compile(r'CREDENTIALS_VAULT-[0-9A-Fa-f]+')
+
+class Catalog:
+
+    """A set of entity ids fetched from the tenant once and refreshed when older than ttl seconds
+    :param fetch: Callable returning an iterable of ids
+    :param ttl: Number of seconds a fetched catalog stays valid
+    """
+
+    def __init__(self, fetch, ttl:float=300):
+        self.__fetch = fetch
+        self.ttl = ttl
+        self.__ids = None
+        self.__fetched_at = 0
+        self.__lock = threading.Lock()
+
+    def ids(self):
+        with self.__lock:
+            if self.__ids is None or time.monotonic() - self.__fetched_at > self.ttl:
+                self.__ids = frozenset(self.__fetch())
+                self.__fetched_at = time.monotonic()
+            return self.__ids
+
+    def refresh(self):
+        with self.__lock:
+            self.__ids = None
+
+class DraftValidator:
+
+    """Checks draft monitors locally so malformed ones are rejected before any request is sent
+    Location and credential references are checked against cached catalogs of the tenant's synthetic locations and credentials.
+    :param request_data: The tenant and headers used to fetch the catalogs
+    :param ttl: Number of seconds the catalogs are cached for
+    """
+
+    def __init__(self, request_data:dict, ttl:float=300):
+        self._request_data = request_data
+        self.locations = Catalog(self.__fetch_locations, ttl)
+        self.credentials = Catalog(self.__fetch_credentials, ttl)
+
+    def validate(self, monitor):
+        """Returns a list of problems found with the monitor, empty when it is valid
+        :param monitor: A draft monitor or a monitor dict
+        """
+        data = monitor.data() if hasattr(monitor, 'data') else monitor
+        errors = []
+
+        for key in ('name', 'enabled', 'type', 'script', 'locations'):
+            if key not in data or data[key] is None: errors.append(f'Missing required field "{key}".')
+        if errors: return errors
+
+        if data['type'] == 'HTTP':
+            errors += self.__validate_http_script(data['script'])
+            if data.get('frequencyMin') not in VALID_FREQUENCIES: errors.append(f'Invalid frequencyMin {data.get("frequencyMin")}.')
+        elif data['type'] == 'BROWSER':
+            errors += self.__validate_browser_script(data['script'])
+            if data.get('frequencyMin') is not None and data['frequencyMin'] not in VALID_FREQUENCIES: errors.append(f'Invalid frequencyMin {data["frequencyMin"]}.')
+        else:
+            errors.append(f'Invalid type {data["type"]}.')
+
+        if type(data['locations']) != list or not data['locations']:
+            errors.append('At least one location is required.')
+        else:
+            known_locations = self.locations.ids()
+            for location in data['locations']:
+                if location not in known_locations: errors.append(f'Unknown location {location}.')
+
+        referenced = set(CREDENTIAL_ID.findall(str(data['script'])))
+        if referenced:
+            known_credentials = self.credentials.ids()
+            for credential in sorted(referenced - known_credentials):
+                errors.append(f'Unknown credential {credential}.')
+
+        return errors
+
+    def validate_all(self, monitors:list):
+        """Splits monitors into those that passed validation and (monitor, errors) pairs for those that did not"""
+        valid = []
+        invalid = []
+        for monitor in monitors:
+            errors = self.validate(monitor)
+            if errors:
+                invalid.append((monitor, errors))
+            else:
+                valid.append(monitor)
+        return {'valid' : valid, 'invalid' : invalid}
+
+    def __validate_http_script(self, script:dict):
+        errors = []
+        if not script.get('requests'): return ['HTTP script has no requests.']
+        for i, request in enumerate(script['requests']):
+            for key in ('description', 'url', 'method'):
+                if not request.get(key): errors.append(f'Request {i} is missing "{key}".')
+            if request.get('method') and request['method'] not in VALID_METHODS: errors.append(f'Request {i} has invalid method {request["method"]}.')
+        return errors
+
+    def __validate_browser_script(self, script:dict):
+        errors = []
+        if not script.get('events'): return ['Browser script has no events.']
+        for i, event in enumerate(script['events']):
+            if event.get('type') not in EVENT_CLASSES: errors.append(f'Event {i} has invalid type {event.get("type")}.')
+        if script['events'][0].get('type') != 'navigate': errors.append('The first event of a browser script must be navigate.')
+        return errors
+
+    def __fetch_locations(self):
+        ok, data = get_json(self._request_data, self._request_data['tenant'] + '/api/v1/synthetic/locations')
+        if not ok: raise Exception(data)
+        return [x['entityId'] for x in data['locations']]
+
+    def __fetch_credentials(self):
+        url = self._request_data['tenant'] + '/api/config/v1/credentials'
+        ids = []
+        while True:
+            ok, data = get_json(self._request_data, url)
+            if not ok: raise Exception(data)
+            ids += [x['id'] for x in data['credentials']]
+            if not data.get('nextPageKey'): return ids
+            url = self._request_data['tenant'] + f'/api/config/v1/credentials?nextPageKey={data["nextPageKey"]}'
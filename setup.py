@@ -1,4 +1,4 @@
-from distutils.core import setup
+from setuptools import setup
 
 setup(
   name = 'dtsynthetic',
@@ -10,6 +10,10 @@ setup(
   url = 'https://github.com/brandonsturrock/dtsynthetic',
   install_requires=[
           'requests',
-          'pandas'
+          'pandas',
+          'numpy'
       ],
-)
\ No newline at end of file
+  entry_points = {
+      'console_scripts' : ['dtsynthetic = dtsynthetic.cli:main']
+  },
+)
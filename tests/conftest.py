@@ -0,0 +1,106 @@
+import copy
+import json
+
+import pytest
+import requests
+
+TENANT = 'https://tenant.example.com'
+
+HTTP_MONITOR = {
+    'name' : 'http check',
+    'entityId' : 'SYNTHETIC_TEST-1',
+    'enabled' : True,
+    'type' : 'HTTP',
+    'createdFrom' : 'API',
+    'frequencyMin' : 5,
+    'locations' : ['GEOLOCATION-1'],
+    'anomalyDetection' : {'loadingTimeThresholds' : {'enabled' : True}},
+    'managementZones' : [{'id' : '1', 'name' : 'zone'}],
+    'automaticallyAssignedApps' : [],
+    'manuallyAssignedApps' : ['APPLICATION-1'],
+    'tags' : [{'key' : 'env', 'value' : 'prod'}],
+    'script' : {
+        'version' : '1.0',
+        'requests' : [{
+            'description' : 'login',
+            'url' : 'https://example.com/login',
+            'method' : 'POST',
+            'requestBody' : '{"user" : "a"}',
+            'validation' : {'rules' : [{'type' : 'httpStatusesList', 'value' : '>=400', 'passIfFound' : False}]},
+            'configuration' : {'acceptAnyCertificate' : True, 'followRedirects' : True},
+            'authentication' : {'type' : 'BASIC_AUTHENTICATION', 'credentials' : 'CREDENTIALS_VAULT-1'},
+            'preProcessingScript' : 'api.info("pre");',
+            'postProcessingScript' : 'api.setValue("token", response.getResponseBody());'
+        }]
+    }
+}
+
+BROWSER_MONITOR = {
+    'name' : 'browser check',
+    'entityId' : 'SYNTHETIC_TEST-2',
+    'enabled' : False,
+    'type' : 'BROWSER',
+    'createdFrom' : 'GUI',
+    'frequencyMin' : 15,
+    'locations' : ['GEOLOCATION-1', 'SYNTHETIC_LOCATION-2'],
+    'anomalyDetection' : {'loadingTimeThresholds' : {'enabled' : False}},
+    'managementZones' : [],
+    'automaticallyAssignedApps' : ['APPLICATION-2'],
+    'manuallyAssignedApps' : ['APPLICATION-3'],
+    'keyPerformanceMetrics' : {'loadActionKpm' : 'VISUALLY_COMPLETE', 'xhrActionKpm' : 'VISUALLY_COMPLETE'},
+    'tags' : [],
+    'script' : {
+        'type' : 'clickpath',
+        'version' : '1.0',
+        'configuration' : {'device' : {'deviceName' : 'Desktop'}, 'bypassCSP' : True},
+        'events' : [
+            {'type' : 'navigate', 'description' : 'open', 'url' : 'https://example.com', 'wait' : {'waitFor' : 'page_complete'}},
+            {'type' : 'keystrokes', 'description' : 'user', 'textValue' : '', 'masked' : False, 'simulateBlurEvent' : True, 'credential' : {'type' : 'USERNAME_PASSWORD', 'field' : 'username', 'id' : 'CREDENTIALS_VAULT-2'}, 'target' : {'locators' : [{'type' : 'css', 'value' : '#user'}]}},
+            {'type' : 'javascript', 'description' : 'script', 'javaScript' : 'api.info(document.title);', 'wait' : {'waitFor' : 'time', 'milliseconds' : 100}},
+            {'type' : 'click', 'description' : 'submit', 'button' : 0, 'target' : {'locators' : [{'type' : 'css', 'value' : '#go'}]}}
+        ]
+    }
+}
+
+class FakeResponse:
+    def __init__(self, content, status_code=200):
+        self.content = content if isinstance(content, bytes) else content.encode()
+        self._content = self.content
+        self.status_code = status_code
+        self.ok = status_code < 400
+
+@pytest.fixture
+def tenant(monkeypatch):
+    """Fakes the monitor, execution batch and synthetic endpoints of TENANT, recording every read and write"""
+    state = {'monitors' : {x['entityId'] : copy.deepcopy(x) for x in (HTTP_MONITOR, BROWSER_MONITOR)}, 'batches' : {}, 'get' : [], 'put' : {}, 'post' : [], 'executions' : []}
+
+    def fake_get(url, headers=None):
+        state['get'].append(url)
+        path, _, query = url[len(TENANT):].partition('?')
+        if path == '/api/v1/synthetic/monitors':
+            filters = dict(x.split('=', 1) for x in query.split('&') if x)
+            listed = [x for x in state['monitors'].values() if filters.get('type', x['type']) == x['type']]
+            return FakeResponse(json.dumps({'monitors' : [{k : x[k] for k in ('name', 'entityId', 'enabled', 'type')} for x in listed]}))
+        if path.startswith('/api/v2/synthetic/executions/batch/'):
+            batchId = path.rsplit('/', 1)[1]
+            if batchId not in state['batches']: return FakeResponse('not found', 404)
+            return FakeResponse(json.dumps(state['batches'][batchId]))
+        entityId = path.rsplit('/', 1)[1]
+        if entityId not in state['monitors']: return FakeResponse('not found', 404)
+        return FakeResponse(json.dumps(state['monitors'][entityId]))
+
+    def fake_put(url, headers=None, data=None):
+        state['put'][url.rsplit('/', 1)[1]] = json.loads(data)
+        return FakeResponse(b'', 204)
+
+    def fake_post(url, data=None, headers=None):
+        if url.endswith('/api/v2/synthetic/executions/batch'):
+            state['executions'].append(json.loads(data))
+            return FakeResponse(json.dumps({'batchId' : f'BATCH-{len(state["executions"])}', 'triggeredCount' : 1}))
+        state['post'].append(json.loads(data))
+        return FakeResponse(json.dumps({'entityId' : f'SYNTHETIC_TEST-{100 + len(state["post"])}'}))
+
+    monkeypatch.setattr(requests, 'get', fake_get)
+    monkeypatch.setattr(requests, 'put', fake_put)
+    monkeypatch.setattr(requests, 'post', fake_post)
+    return state
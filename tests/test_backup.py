@@ -0,0 +1,59 @@
+import copy
+import json
+
+from dtsynthetic import SyntheticAPI
+from dtsynthetic.snapshot import read_snapshot
+from tests.conftest import TENANT, HTTP_MONITOR, BROWSER_MONITOR
+
+SERVER_FIELDS = {'entityId', 'createdFrom', 'managementZones', 'automaticallyAssignedApps'}
+
+def test_export_is_lossless(tenant, tmp_path):
+    api = SyntheticAPI(TENANT, 'token')
+    path = str(tmp_path / 'backup.jsonl.gz')
+
+    result = api.export_jsonl(path)
+
+    assert result['success_count'] == 2
+    assert result['failure_count'] == 0
+    assert sorted(read_snapshot(path), key=lambda x: x['entityId']) == [HTTP_MONITOR, BROWSER_MONITOR]
+
+def test_import_round_trips_updates_and_creates(tenant, tmp_path):
+    api = SyntheticAPI(TENANT, 'token')
+    path = str(tmp_path / 'backup.jsonl')
+    api.export_jsonl(path)
+    del tenant['monitors']['SYNTHETIC_TEST-2']
+
+    result = api.import_jsonl(path)
+
+    assert result['success_count'] == 2
+    assert result['failure_count'] == 0
+    assert tenant['put'] == {'SYNTHETIC_TEST-1' : HTTP_MONITOR}
+    assert len(tenant['post']) == 1
+    created = {k : v for k, v in tenant['post'][0].items() if k not in SERVER_FIELDS}
+    assert created == {k : v for k, v in BROWSER_MONITOR.items() if k not in SERVER_FIELDS}
+
+def test_import_reports_bad_records_and_carries_on(tenant, tmp_path):
+    api = SyntheticAPI(TENANT, 'token')
+    path = tmp_path / 'backup.jsonl'
+    bad = dict(copy.deepcopy(HTTP_MONITOR), entityId='SYNTHETIC_TEST-9', type='MULTI_PROTOCOL')
+    path.write_text(json.dumps(bad) + '\n' + json.dumps(dict(copy.deepcopy(HTTP_MONITOR), entityId='SYNTHETIC_TEST-10')) + '\n')
+
+    result = api.import_jsonl(str(path))
+
+    assert result['success_count'] == 1
+    assert result['failure_count'] == 1
+    assert result['failure'][0]['entityId'] == 'SYNTHETIC_TEST-9'
+    assert 'MULTI_PROTOCOL' in result['failure'][0]['message']
+
+def test_export_reports_monitors_that_fail_to_hydrate(tenant, tmp_path, monkeypatch):
+    api = SyntheticAPI(TENANT, 'token')
+    listed = api.get_monitors()
+    del tenant['monitors']['SYNTHETIC_TEST-2']
+    monkeypatch.setattr(api, 'get_monitors', lambda params={}: listed)
+    path = str(tmp_path / 'backup.jsonl')
+
+    result = api.export_jsonl(path)
+
+    assert result['success_count'] == 1
+    assert result['failure'][0]['entityId'] == 'SYNTHETIC_TEST-2'
+    assert [x['entityId'] for x in read_snapshot(path)] == ['SYNTHETIC_TEST-1']
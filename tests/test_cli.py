@@ -0,0 +1,141 @@
+import io
+import json
+import sys
+import time
+
+import requests
+
+from dtsynthetic.cli import main
+from dtsynthetic.snapshot import read_snapshot
+from tests.conftest import TENANT, HTTP_MONITOR, BROWSER_MONITOR, FakeResponse
+
+def run(monkeypatch, capsys, args, stdin=''):
+    monkeypatch.setattr(sys, 'stdin', io.StringIO(stdin))
+    code = main(['--tenant', TENANT, '--token', 'token'] + args)
+    out, err = capsys.readouterr()
+    return code, [json.loads(x) for x in out.splitlines()], err
+
+def test_list_applies_filters(tenant, monkeypatch, capsys):
+    code, records, err = run(monkeypatch, capsys, ['list', '--type', 'BROWSER'])
+
+    assert code == 0
+    assert records == [{'name' : 'browser check', 'entityId' : 'SYNTHETIC_TEST-2', 'enabled' : False, 'type' : 'BROWSER'}]
+    assert tenant['get'] == [TENANT + '/api/v1/synthetic/monitors?type=BROWSER']
+
+def test_hydrate_reads_each_monitor_once(tenant, monkeypatch, capsys):
+    code, records, err = run(monkeypatch, capsys, ['hydrate'], 'SYNTHETIC_TEST-1\n{"entityId" : "SYNTHETIC_TEST-2"}\n')
+
+    assert code == 0
+    assert records == [HTTP_MONITOR, BROWSER_MONITOR]
+    assert sorted(tenant['get']) == [TENANT + '/api/v1/synthetic/monitors/SYNTHETIC_TEST-1', TENANT + '/api/v1/synthetic/monitors/SYNTHETIC_TEST-2']
+
+def test_hydrate_reports_unknown_monitors(tenant, monkeypatch, capsys):
+    code, records, err = run(monkeypatch, capsys, ['hydrate'], 'SYNTHETIC_TEST-9\n')
+
+    assert code == 1
+    assert records == [{'entityId' : 'SYNTHETIC_TEST-9', 'error' : 'not found'}]
+
+def test_export_to_stdout(tenant, monkeypatch, capsys):
+    code, records, err = run(monkeypatch, capsys, ['export'])
+
+    assert code == 0
+    assert records == [HTTP_MONITOR, BROWSER_MONITOR]
+    assert '2 processed, 2 ok, 0 failed' in err
+
+def test_export_leaves_failed_monitors_out_of_the_file(tenant, monkeypatch, capsys, tmp_path):
+    get = requests.get
+    monkeypatch.setattr(requests, 'get', lambda url, headers=None: FakeResponse('not found', 404) if url.endswith('/SYNTHETIC_TEST-2') else get(url, headers))
+    path = str(tmp_path / 'backup.jsonl')
+
+    code, records, err = run(monkeypatch, capsys, ['export', path])
+
+    assert code == 1
+    assert records == []
+    assert [x['entityId'] for x in read_snapshot(path)] == ['SYNTHETIC_TEST-1']
+    assert json.loads(err.splitlines()[0]) == {'entityId' : 'SYNTHETIC_TEST-2', 'error' : 'Could not fetch details for SYNTHETIC_TEST-2'}
+    assert '2 processed, 1 ok, 1 failed' in err
+
+def test_import_streams_results_and_survives_bad_records(tenant, monkeypatch, capsys):
+    good = dict(HTTP_MONITOR, entityId='SYNTHETIC_TEST-10')
+    bad = dict(HTTP_MONITOR, entityId='SYNTHETIC_TEST-11', type='MULTI_PROTOCOL')
+    code, records, err = run(monkeypatch, capsys, ['import'], json.dumps(good) + '\n' + json.dumps(bad) + '\n')
+
+    assert code == 1
+    assert records[0] == {'entityId' : 'SYNTHETIC_TEST-101', 'status' : 201}
+    assert records[1]['entityId'] == 'SYNTHETIC_TEST-11'
+    assert 'MULTI_PROTOCOL' in records[1]['error']
+    assert '2 processed, 1 ok, 1 failed' in err
+    assert len(tenant['post']) == 1
+
+def test_dry_run_import_rejects_bare_ids(tenant, monkeypatch, capsys):
+    code, records, err = run(monkeypatch, capsys, ['--dry-run', 'import'], 'SYNTHETIC_TEST-1\n' + json.dumps(HTTP_MONITOR) + '\n')
+
+    assert code == 1
+    assert 'Expected a monitor JSON object' in records[0]['error']
+    assert records[1] == {'entityId' : 'SYNTHETIC_TEST-1', 'name' : 'http check', 'action' : 'update'}
+    assert tenant['put'] == {} and tenant['post'] == []
+
+def test_tag_adds_and_removes(tenant, monkeypatch, capsys):
+    code, records, err = run(monkeypatch, capsys, ['tag', '--add', 'team=ops', '--add', 'critical', '--remove', 'env'], 'SYNTHETIC_TEST-1\n')
+
+    assert code == 0
+    assert records == [{'entityId' : 'SYNTHETIC_TEST-1', 'status' : 204}]
+    assert tenant['put']['SYNTHETIC_TEST-1']['tags'] == [{'key' : 'team', 'value' : 'ops'}, {'key' : 'critical'}]
+
+def test_dry_run_tag_writes_nothing(tenant, monkeypatch, capsys):
+    code, records, err = run(monkeypatch, capsys, ['--dry-run', 'tag', '--add', 'team=ops'], 'SYNTHETIC_TEST-1\n')
+
+    assert records == [{'entityId' : 'SYNTHETIC_TEST-1', 'tags' : [{'key' : 'env', 'value' : 'prod'}, {'key' : 'team', 'value' : 'ops'}]}]
+    assert tenant['put'] == {}
+    assert '(dry run)' in err
+
+def test_enable_and_disable(tenant, monkeypatch, capsys):
+    code, records, err = run(monkeypatch, capsys, ['enable'], 'SYNTHETIC_TEST-2\n')
+    assert records == [{'entityId' : 'SYNTHETIC_TEST-2', 'status' : 204}]
+    assert tenant['put']['SYNTHETIC_TEST-2']['enabled'] is True
+
+    code, records, err = run(monkeypatch, capsys, ['disable'], 'SYNTHETIC_TEST-1\n')
+    assert records == [{'entityId' : 'SYNTHETIC_TEST-1', 'status' : 204}]
+    assert tenant['put']['SYNTHETIC_TEST-1']['enabled'] is False
+
+def test_dry_run_enable_writes_nothing(tenant, monkeypatch, capsys):
+    code, records, err = run(monkeypatch, capsys, ['--dry-run', 'enable'], 'SYNTHETIC_TEST-2\n')
+
+    assert records == [{'entityId' : 'SYNTHETIC_TEST-2', 'enabled' : False, 'target' : True}]
+    assert tenant['put'] == {}
+
+def test_rate_limit_spaces_out_writes(tenant, monkeypatch, capsys):
+    started = time.monotonic()
+    code, records, err = run(monkeypatch, capsys, ['--rate-limit', '20', 'disable'], 'SYNTHETIC_TEST-1\n' * 3)
+
+    assert code == 0
+    assert len(records) == 3
+    assert time.monotonic() - started >= 0.1
+
+def test_execute_triggers_batches(tenant, monkeypatch, capsys):
+    code, records, err = run(monkeypatch, capsys, ['execute', '--count', '2', '--execution-location', 'GEOLOCATION-1'], 'SYNTHETIC_TEST-1\nSYNTHETIC_TEST-2\n')
+
+    assert code == 0
+    assert sorted(x['batchId'] for x in records) == ['BATCH-1', 'BATCH-2']
+    assert sorted(x['monitors'][0]['monitorId'] for x in tenant['executions']) == ['SYNTHETIC_TEST-1', 'SYNTHETIC_TEST-2']
+    assert all(x['monitors'][0]['executionCount'] == 2 and x['monitors'][0]['locations'] == ['GEOLOCATION-1'] for x in tenant['executions'])
+    # The disabled monitor is enabled for the execution and disabled again afterwards
+    assert tenant['put']['SYNTHETIC_TEST-2']['enabled'] is False
+
+def test_dry_run_execute_triggers_nothing(tenant, monkeypatch, capsys):
+    code, records, err = run(monkeypatch, capsys, ['--dry-run', 'execute'], 'SYNTHETIC_TEST-2\n')
+
+    assert records == [{'entityId' : 'SYNTHETIC_TEST-2', 'action' : 'execute', 'enabled' : False}]
+    assert tenant['executions'] == [] and tenant['put'] == {}
+
+def test_wait_reports_each_batch_once(tenant, monkeypatch, capsys):
+    tenant['batches'] = {'BATCH-1' : {'batchStatus' : 'SUCCESS'}, 'BATCH-2' : {'batchStatus' : 'FAILED'}, 'BATCH-3' : {'batchStatus' : 'RUNNING'}}
+    stdin = '{"batchId" : "BATCH-1"}\n{"batchId" : "BATCH-1"}\nBATCH-2\nBATCH-3\n'
+
+    code, records, err = run(monkeypatch, capsys, ['wait', '--timeout', '0.05', '--interval', '0.01'], stdin)
+
+    assert code == 1
+    assert [(x['batchId'], x['batchStatus']) for x in records] == [('BATCH-1', 'SUCCESS'), ('BATCH-2', 'FAILED'), ('BATCH-3', 'RUNNING')]
+    assert 'error' not in records[0]
+    assert records[1]['error'] == 'FAILED'
+    assert 'Timed out' in records[2]['error']
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from dtsynthetic.duplicates import DuplicateIndex
+
+def http_monitor(entityId, urls, frequency=5, description='check'):
+    return {
+        'entityId' : entityId,
+        'name' : entityId,
+        'type' : 'HTTP',
+        'enabled' : True,
+        'frequencyMin' : frequency,
+        'locations' : ['L1', 'L2'],
+        'script' : {'version' : '1.0', 'requests' : [{'description' : description, 'url' : x, 'method' : 'GET'} for x in urls]}
+    }
+
+URLS = [f'https://example.com/step/{i}' for i in range(10)]
+MONITORS = [
+    http_monitor('A', URLS),
+    http_monitor('B', URLS, frequency=15, description='same requests, other description'),
+    http_monitor('C', list(reversed(URLS))),
+    http_monitor('D', URLS[:9] + ['https://example.com/step/changed']),
+    http_monitor('E', ['https://other.com/' + str(i) for i in range(10)])
+]
+
+def entity_clusters(index, mode, threshold=0.7):
+    return sorted(sorted(index.entityIds[x] for x in cluster) for cluster in index.clusters(mode, threshold))
+
+def test_modes():
+    index = DuplicateIndex(MONITORS)
+    assert entity_clusters(index, 'exact') == [['A', 'B']]
+    assert entity_clusters(index, 'unordered') == [['A', 'B', 'C']]
+    assert entity_clusters(index, 'near') == [['A', 'B', 'C', 'D']]
+
+def test_report_counts_saved_executions():
+    report = DuplicateIndex(MONITORS).report('exact')
+    assert report.loc[0, 'keep'] == 'A'
+    assert report.loc[0, 'duplicates'] == ['B']
+    # B runs every 15 minutes from two locations
+    assert report.loc[0, 'saved_per_day'] == pytest.approx(2 / 15 * 1440)
+
+def test_near_clusters_do_not_depend_on_hash_seed():
+    script = 'from tests.test_duplicates import MONITORS, entity_clusters; from dtsynthetic.duplicates import DuplicateIndex; print(entity_clusters(DuplicateIndex(MONITORS, num_perm=16), "near"))'
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    outputs = {subprocess.run([sys.executable, '-c', script], cwd=root, env=dict(os.environ, PYTHONHASHSEED=str(seed)), capture_output=True, text=True, check=True).stdout for seed in (1, 2, 3)}
+    assert len(outputs) == 1
@@ -0,0 +1,123 @@
+import json
+import threading
+import time
+
+import requests
+
+from dtsynthetic.flight import SingleFlight, get_json
+
+class FakeResponse:
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+        self.ok = status_code < 400
+
+def run_concurrently(fn, count):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+    errors = [None] * count
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = fn()
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+    return results, errors
+
+def test_concurrent_calls_share_one_request():
+    flight = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return {'tags' : []}
+
+    results, errors = run_concurrently(lambda: flight.do('key', fetch), 8)
+
+    assert len(calls) == 1
+    assert errors == [None] * 8
+    assert flight.stats() == {'calls' : 1, 'shared' : 7, 'in_flight' : 0}
+    # Every caller gets its own copy of the result
+    results[0]['tags'].append('x')
+    assert all(x == {'tags' : []} for x in results[1:])
+
+def test_sequential_calls_are_not_shared():
+    flight = SingleFlight()
+    flight.do('key', lambda: 1)
+    flight.do('key', lambda: 2)
+    assert flight.stats()['calls'] == 2
+    assert flight.stats()['shared'] == 0
+
+def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+    error = ValueError('boom')
+
+    def fetch():
+        time.sleep(0.2)
+        raise error
+
+    results, errors = run_concurrently(lambda: flight.do('key', fetch), 4)
+
+    assert errors.count(error) == 1
+    waiters = [x for x in errors if x is not error]
+    assert len(waiters) == 3
+    assert len({id(x) for x in waiters}) == 3
+    assert all(x.__cause__ is error for x in waiters)
+    assert flight.stats()['in_flight'] == 0
+
+def test_base_exceptions_reach_every_waiter():
+    flight = SingleFlight()
+    started = threading.Event()
+    errors = []
+
+    class Abort(BaseException):
+        pass
+
+    def fetch():
+        started.set()
+        time.sleep(0.2)
+        raise Abort()
+
+    def leader():
+        try:
+            flight.do('key', fetch)
+        except BaseException as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=leader)
+    thread.start()
+    started.wait()
+    try:
+        flight.do('key', fetch)
+    except Exception as e:
+        waiter_error = e
+    thread.join()
+
+    assert isinstance(errors[0], Abort)
+    assert waiter_error.__cause__ is errors[0]
+    assert flight.stats()['in_flight'] == 0
+
+def test_get_json_coalesces_through_request_data(monkeypatch):
+    calls = []
+
+    def fake_get(url, headers=None):
+        calls.append(url)
+        time.sleep(0.2)
+        return FakeResponse(json.dumps({'entityId' : 'SYNTHETIC_TEST-1'}))
+
+    monkeypatch.setattr(requests, 'get', fake_get)
+    request_data = {'headers' : {}, 'flight' : SingleFlight()}
+    results, errors = run_concurrently(lambda: get_json(request_data, 'https://tenant/monitors/1'), 5)
+
+    assert calls == ['https://tenant/monitors/1']
+    assert results == [(True, {'entityId' : 'SYNTHETIC_TEST-1'})] * 5
+
+def test_get_json_without_flight_reports_failures(monkeypatch):
+    monkeypatch.setattr(requests, 'get', lambda url, headers=None: FakeResponse(b'not found', 404))
+    assert get_json({'headers' : {}}, 'https://tenant/monitors/1') == (False, b'not found')
@@ -0,0 +1,46 @@
+import threading
+import time
+
+from dtsynthetic.parallel import bounded_map, RateLimiter
+
+def test_results_keep_input_order():
+    def slow_for_early_items(x):
+        time.sleep(0.01 * (10 - x))
+        return x * 2
+
+    assert list(bounded_map(slow_for_early_items, range(10), workers=4)) == [x * 2 for x in range(10)]
+
+def test_input_is_pulled_lazily():
+    pulled = []
+    lock = threading.Lock()
+
+    def source():
+        for x in range(100):
+            with lock:
+                pulled.append(x)
+            yield x
+
+    results = bounded_map(lambda x: x, source(), workers=2, window=4)
+    assert next(results) == 0
+    # Only the window plus the item that triggered the first yield have been read
+    assert len(pulled) <= 5
+    assert list(results) == list(range(1, 100))
+
+def test_exceptions_propagate():
+    def fail_on_three(x):
+        if x == 3: raise ValueError(x)
+        return x
+
+    results = bounded_map(fail_on_three, range(5), workers=2)
+    try:
+        list(results)
+        assert False, 'expected ValueError'
+    except ValueError as e:
+        assert e.args == (3,)
+
+def test_rate_limiter_spaces_calls():
+    limiter = RateLimiter(50)
+    started = time.monotonic()
+    list(bounded_map(lambda x: x, range(11), workers=4, limiter=limiter))
+    # 11 calls at 50 per second need at least 10 intervals of 20ms
+    assert time.monotonic() - started >= 0.19
@@ -0,0 +1,31 @@
+import pytest
+
+from dtsynthetic.planning import LoadPlanner
+
+def monitors(count, locations, frequency=1, prefix='M', type='HTTP'):
+    return [{'entityId' : f'{prefix}{i}', 'name' : f'{prefix}{i}', 'type' : type, 'enabled' : True, 'frequencyMin' : frequency, 'locations' : list(locations)} for i in range(count)]
+
+def test_location_load_splits_http_and_browser():
+    load = LoadPlanner(monitors(2, ['A']) + monitors(1, ['A', 'B'], 5, 'B', 'BROWSER')).location_load()
+    assert load.loc['A', 'HTTP'] == 2
+    assert load.loc['A', 'BROWSER'] == pytest.approx(0.2)
+    assert load.loc['B', 'total'] == pytest.approx(0.2)
+
+def test_frequency_cuts_are_spread_one_step_at_a_time():
+    plan = LoadPlanner(monitors(10, ['A', 'B'])).plan(4)
+
+    assert plan.overloaded == []
+    assert plan.after['A'] == pytest.approx(plan.after['B'])
+    assert 3.5 < plan.after['A'] <= 4
+    # Nobody jumps straight to the slowest frequency
+    assert max(x['frequencyMin'] for x in plan.changes.values()) <= 5
+
+def test_moved_monitors_are_not_slowed():
+    plan = LoadPlanner(monitors(6, ['A']) + monitors(2, ['C'], prefix='C')).plan({'A' : 2, 'C' : 4}, alternatives={'A' : ['C']})
+
+    moved = [x for x, change in plan.changes.items() if change['locations'] == ['C']]
+    assert len(moved) == 2
+    assert all(plan.changes[x]['frequencyMin'] == 1 for x in moved)
+    assert plan.after['C'] == pytest.approx(4)
+    assert plan.after['A'] <= 2
+    assert plan.overloaded == []
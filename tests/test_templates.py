@@ -0,0 +1,81 @@
+import pandas as pd
+import pytest
+
+from dtsynthetic.templates import MonitorTemplate
+
+TEMPLATE = {
+    'name' : 'Check {{host}}',
+    'enabled' : True,
+    'type' : 'HTTP',
+    'frequencyMin' : '{{freq}}',
+    'locations' : '{{locs}}',
+    'script' : {'version' : '1.0', 'requests' : [{'description' : 'health', 'url' : 'https://{{host}}/health', 'method' : 'GET'}]},
+    'tags' : [{'key' : 'team', 'value' : '{{team}}'}]
+}
+
+TYPES = {'freq' : 'int', 'locs' : 'list'}
+
+def test_render_fills_placeholders():
+    monitor = MonitorTemplate(TEMPLATE).render({'host' : 'a.com', 'freq' : 5, 'locs' : ['L1'], 'team' : 'ops'})
+    assert monitor['name'] == 'Check a.com'
+    assert monitor['frequencyMin'] == 5
+    assert monitor['locations'] == ['L1']
+    assert monitor['script']['requests'][0]['url'] == 'https://a.com/health'
+    assert monitor['tags'] == [{'key' : 'team', 'value' : 'ops'}]
+
+def test_csv_rows_are_coerced(tmp_path):
+    path = tmp_path / 'rows.csv'
+    pd.DataFrame([
+        {'host' : 'a.com', 'freq' : 5, 'locs' : 'L1,L2', 'team' : 'ops'},
+        {'host' : 'b.com', 'freq' : None, 'locs' : 'L3', 'team' : 'ops'},
+        {'host' : 'c.com', 'freq' : 15, 'locs' : 'L3', 'team' : 'ops'}
+    ]).to_csv(path, index=False)
+    template = MonitorTemplate(TEMPLATE, TYPES)
+    rows = pd.read_csv(path).to_dict('records')
+
+    first = template.render(rows[0])
+    assert first['locations'] == ['L1', 'L2']
+    assert first['frequencyMin'] == 5 and type(first['frequencyMin']) == int
+    with pytest.raises(Exception, match='freq'):
+        template.render(rows[1])
+    assert template.render(rows[2])['frequencyMin'] == 15
+
+def test_fractional_int_strings_are_rejected():
+    template = MonitorTemplate(TEMPLATE, TYPES)
+    row = {'host' : 'a.com', 'locs' : 'L1', 'team' : 'ops'}
+    assert template.render(dict(row, freq='5.0'))['frequencyMin'] == 5
+    for freq in ('5.5', 5.5):
+        with pytest.raises(Exception, match='whole number'):
+            template.render(dict(row, freq=freq))
+
+def test_blank_cells_are_missing():
+    with pytest.raises(Exception, match='host'):
+        MonitorTemplate(TEMPLATE).render({'host' : float('nan'), 'freq' : 5, 'locs' : ['L1'], 'team' : 'ops'})
+
+def test_process_pool_matches_serial():
+    template = MonitorTemplate(TEMPLATE, TYPES)
+    rows = [{'host' : f'h{i}.com', 'freq' : '5', 'locs' : 'L1', 'team' : 'ops'} for i in range(1000)]
+    assert list(template.render_all(iter(rows), processes=2, chunksize=64)) == list(template.render_all(rows))
+
+def test_unknown_type_parameter_is_rejected():
+    with pytest.raises(Exception, match='Unknown template parameter'):
+        MonitorTemplate(TEMPLATE, {'nope' : 'int'})
+
+def test_invalid_event_type_is_rejected_once():
+    template = {
+        'name' : 'Journey {{host}}',
+        'enabled' : True,
+        'type' : 'BROWSER',
+        'locations' : ['L1'],
+        'script' : {'type' : 'clickpath', 'version' : '1.0', 'events' : [{'type' : 'navigate', 'url' : 'https://{{host}}'}, {'type' : 'bogus'}]}
+    }
+    with pytest.raises(Exception, match='invalid type bogus'):
+        MonitorTemplate(template)
+
+def test_request_fields_are_checked():
+    template = dict(TEMPLATE, script={'version' : '1.0', 'requests' : [{'url' : 'https://{{host}}', 'method' : 'GET'}]})
+    with pytest.raises(Exception, match='description'):
+        MonitorTemplate(template)
+    template = dict(TEMPLATE, script={'version' : '1.0', 'requests' : [{'description' : 'x', 'url' : 'https://{{host}}', 'method' : 'FETCH'}]})
+    with pytest.raises(Exception, match='invalid method'):
+        MonitorTemplate(template)
@@ -0,0 +1,149 @@
+import json
+
+import pytest
+import requests
+
+from dtsynthetic import SyntheticAPI
+from dtsynthetic.validation import Catalog
+
+TENANT = 'https://tenant.example.com'
+
+HTTP_DRAFT = {
+    'name' : 'http check',
+    'enabled' : True,
+    'type' : 'HTTP',
+    'frequencyMin' : 5,
+    'locations' : ['GEOLOCATION-1'],
+    'script' : {'version' : '1.0', 'requests' : [{'description' : 'home', 'url' : 'https://example.com', 'method' : 'GET'}]}
+}
+
+BROWSER_DRAFT = {
+    'name' : 'browser check',
+    'enabled' : True,
+    'type' : 'BROWSER',
+    'frequencyMin' : 15,
+    'locations' : ['GEOLOCATION-1'],
+    'script' : {
+        'type' : 'clickpath',
+        'version' : '1.0',
+        'events' : [
+            {'type' : 'navigate', 'description' : 'open', 'url' : 'https://example.com'},
+            {'type' : 'keystrokes', 'description' : 'user', 'textValue' : '', 'credential' : {'type' : 'USERNAME_PASSWORD', 'field' : 'username', 'id' : 'CREDENTIALS_VAULT-1'}}
+        ]
+    }
+}
+
+class FakeResponse:
+    def __init__(self, content, status_code=200):
+        self.content = content if isinstance(content, bytes) else content.encode()
+        self._content = self.content
+        self.status_code = status_code
+        self.ok = status_code < 400
+
+@pytest.fixture
+def catalogs(monkeypatch):
+    state = {'get' : [], 'post' : []}
+    pages = {
+        None : {'credentials' : [{'id' : 'CREDENTIALS_VAULT-1'}], 'nextPageKey' : 'page2'},
+        'page2' : {'credentials' : [{'id' : 'CREDENTIALS_VAULT-2'}]}
+    }
+
+    def fake_get(url, headers=None):
+        state['get'].append(url)
+        path = url[len(TENANT):]
+        if path == '/api/v1/synthetic/locations':
+            return FakeResponse(json.dumps({'locations' : [{'entityId' : 'GEOLOCATION-1'}, {'entityId' : 'SYNTHETIC_LOCATION-2'}]}))
+        if path.startswith('/api/config/v1/credentials'):
+            _, _, key = path.partition('?nextPageKey=')
+            return FakeResponse(json.dumps(pages[key or None]))
+        return FakeResponse('not found', 404)
+
+    def fake_post(url, data=None, headers=None):
+        state['post'].append(json.loads(data))
+        return FakeResponse(json.dumps({'entityId' : f'SYNTHETIC_TEST-{len(state["post"])}'}))
+
+    monkeypatch.setattr(requests, 'get', fake_get)
+    monkeypatch.setattr(requests, 'post', fake_post)
+    return state
+
+def draft(base, **changes):
+    return dict(json.loads(json.dumps(base)), **changes)
+
+def test_valid_drafts_pass(catalogs):
+    api = SyntheticAPI(TENANT, 'token')
+    assert api.validator.validate(api.new_monitor(draft(HTTP_DRAFT))) == []
+    assert api.validator.validate(draft(BROWSER_DRAFT)) == []
+
+def test_missing_required_fields(catalogs):
+    api = SyntheticAPI(TENANT, 'token')
+    data = draft(HTTP_DRAFT)
+    del data['locations']
+    del data['name']
+    assert api.validator.validate(data) == ['Missing required field "name".', 'Missing required field "locations".']
+
+def test_invalid_frequency_and_method(catalogs):
+    api = SyntheticAPI(TENANT, 'token')
+    data = draft(HTTP_DRAFT, frequencyMin=7)
+    data['script']['requests'][0]['method'] = 'FETCH'
+    del data['script']['requests'][0]['url']
+    assert api.validator.validate(data) == ['Request 0 is missing "url".', 'Request 0 has invalid method FETCH.', 'Invalid frequencyMin 7.']
+
+def test_unknown_event_types(catalogs):
+    api = SyntheticAPI(TENANT, 'token')
+    data = draft(BROWSER_DRAFT)
+    data['script']['events'] = [{'type' : 'click', 'description' : 'submit'}, {'type' : 'bogus'}]
+    assert api.validator.validate(data) == ['Event 1 has invalid type bogus.', 'The first event of a browser script must be navigate.']
+
+def test_unknown_locations_and_credentials(catalogs):
+    api = SyntheticAPI(TENANT, 'token')
+    data = draft(BROWSER_DRAFT, locations=['GEOLOCATION-1', 'GEOLOCATION-9'])
+    data['script']['events'][1]['credential']['id'] = 'CREDENTIALS_VAULT-F'
+    assert api.validator.validate(data) == ['Unknown location GEOLOCATION-9.', 'Unknown credential CREDENTIALS_VAULT-F.']
+
+def test_credentials_are_paged(catalogs):
+    api = SyntheticAPI(TENANT, 'token')
+    assert api.validator.credentials.ids() == {'CREDENTIALS_VAULT-1', 'CREDENTIALS_VAULT-2'}
+    assert catalogs['get'] == [TENANT + '/api/config/v1/credentials', TENANT + '/api/config/v1/credentials?nextPageKey=page2']
+
+def test_catalogs_are_fetched_once(catalogs):
+    api = SyntheticAPI(TENANT, 'token')
+    for _ in range(3):
+        api.validator.validate(draft(BROWSER_DRAFT))
+    assert len(catalogs['get']) == 3
+
+def test_catalog_refetches_after_ttl_and_refresh(monkeypatch):
+    now = [0.0]
+    fetches = []
+    monkeypatch.setattr('dtsynthetic.validation.time.monotonic', lambda: now[0])
+    catalog = Catalog(lambda: fetches.append(1) or ['A'], ttl=60)
+
+    catalog.ids()
+    now[0] = 59
+    catalog.ids()
+    assert len(fetches) == 1
+    now[0] = 61
+    assert catalog.ids() == {'A'}
+    assert len(fetches) == 2
+    catalog.refresh()
+    catalog.ids()
+    assert len(fetches) == 3
+
+def test_create_rejects_invalid_drafts_without_posting(catalogs):
+    api = SyntheticAPI(TENANT, 'token')
+    invalid = api.new_monitor(draft(HTTP_DRAFT, name='bad', frequencyMin=7))
+
+    result = api.create([invalid])
+
+    assert catalogs['post'] == []
+    assert result['success_count'] == 0
+    assert result['failure'] == [{'status' : None, 'entityId' : None, 'name' : 'bad', 'message' : ['Invalid frequencyMin 7.']}]
+
+def test_create_sends_only_valid_drafts(catalogs):
+    api = SyntheticAPI(TENANT, 'token')
+    monitors = [api.new_monitor(draft(HTTP_DRAFT)), api.new_monitor(draft(HTTP_DRAFT, name='bad', locations=['GEOLOCATION-9']))]
+
+    result = api.create(monitors)
+
+    assert [x['name'] for x in catalogs['post']] == ['http check']
+    assert result['success_count'] == 1
+    assert result['failure'][0]['message'] == ['Unknown location GEOLOCATION-9.']